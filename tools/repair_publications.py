@@ -11,17 +11,36 @@ This script is dependency-free (requests only).
 
 from __future__ import annotations
 
+import functools
+import glob
 import html
+import json
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional
-import os
 import urllib.parse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 FMARTIN_URL = "https://gsyc.urjc.es/~fmartin/"
 UA = "fmrico.github.io/1.0 (mailto:francisco.rico@urjc.es)"
+CROSSREF_MAILTO = "francisco.rico@urjc.es"
+CROSSREF_WORKERS = 16
+
+BIBTEX_DIR = os.path.join(os.path.dirname(__file__), "..", "bibtex")
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache")
+CROSSREF_CACHE_JSON = os.path.join(CACHE_DIR, "crossref.json")
+FMARTIN_CACHE_JSON = os.path.join(CACHE_DIR, "fmartin.json")
+CACHE_TTL_S = 7 * 24 * 3600
+
+# publications.html wraps the generated list in these marker lines.
+PUB_LIST_BEGIN = "<!-- BEGIN_PUB_LIST -->"
+PUB_LIST_END = "<!-- END_PUB_LIST -->"
 
 
 MANUAL_RANKS: dict[str, str] = {
@@ -67,6 +86,8 @@ EXCLUDE_TEXT_SNIPPETS = [
     "planning. wiki-the ai planning & pddl wiki",
     "leading with depth: the impact of emotions and relationships on leadership, 2023",
 ]
+# All snippets in one alternation: a single scan of the card text.
+_RE_EXCLUDE_SNIPPETS = re.compile("|".join(re.escape(snip) for snip in EXCLUDE_TEXT_SNIPPETS))
 
 
 DOI_RANK_OVERRIDES: dict[str, str] = {
@@ -74,7 +95,49 @@ DOI_RANK_OVERRIDES: dict[str, str] = {
 }
 
 
-@dataclass
+_RE_WS = re.compile(r"\s+")
+_RE_QUOTES = re.compile(r"[“”\"']")
+_RE_NONALNUM = re.compile(r"[^a-z0-9]+")
+_RE_TAG = re.compile(r"<.*?>")
+_RE_MD_LINK = re.compile(r"\[(.*?)\]\([^)]*\)")
+_RE_BIBTEX_AUTHOR = re.compile(rb"\bauthor\s*=\s*\{(.*?)\}\s*,", re.S | re.I)
+_RE_BIBTEX_AUTHOR_QUOTED = re.compile(rb'\bauthor\s*=\s*"([^"]+)"', re.I)
+_RE_CITE_TITLE = re.compile(r"[“\"]([^”\"]+)[”\"]")
+_RE_CITE_AUTHORS = re.compile(r"^(.*?),\s*[“\"]")
+_RE_RANK_ENTRY = re.compile(
+    r"\[(Journal\s+Q[1-4]|Journal|Class\s+[1-3])\]"  # label
+    r".*?<b>\s*(?:&quot;|\")\s*(.*?)\s*(?:&quot;|\")\s*</b>",
+    re.S,
+)
+_RE_ARTICLE = re.compile(r"<article class=\"card pub-card\">.*?</article>", re.S)
+# One alternation over every field of a pub-card, so each article is scanned
+# once. Alternatives are tried left to right at each position.
+_RE_CARD_FIELD = re.compile(
+    r"<div class=\"pub-where\">(?P<where>.*?)</div>"
+    r"|<p class=\"pub-cite\">(?P<cite>.*?)</p>"
+    r"|<span class=\"badge\">(?P<year>\d{4})</span>"
+    r"|<span class=\"badge badge-muted\">(?P<badge>.*?)</span>"
+    r"|<p class=\"pub-doi\">\s*DOI:\s*<a[^>]*href=\"(?P<doi_url>[^\"]+)\"[^>]*>(?P<doi>.*?)</a>"
+    r"|<a\s+href=\"(?P<href>[^\"]+)\"[^>]*>(?P<label>[^<]+)</a>",
+    re.S,
+)
+
+
+def _session() -> requests.Session:
+    # Keep-alive pool sized for the Crossref workers; retry transient failures.
+    s = requests.Session()
+    s.headers.update({"User-Agent": UA})
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=CROSSREF_WORKERS, pool_maxsize=CROSSREF_WORKERS, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+_SESSION = _session()
+
+
+@dataclass(slots=True)
 class Card:
     year: str
     where: str
@@ -88,22 +151,33 @@ class Card:
     badge: str
 
 
+@dataclass(slots=True)
+class ParsedCard(Card):
+    # Derived once in parse_cards and reused by filtering and rendering.
+    title: str
+    title_key: str
+    doi_key: str
+
+
+@functools.lru_cache(maxsize=4096)
 def _norm(s: str) -> str:
     s = html.unescape(s)
     s = s.casefold()
-    s = re.sub(r"[“”\"']", "", s)
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    return re.sub(r"\s+", " ", s).strip()
+    s = _RE_QUOTES.sub("", s)
+    s = _RE_NONALNUM.sub(" ", s)
+    return _RE_WS.sub(" ", s).strip()
 
 
+@functools.lru_cache(maxsize=4096)
 def _norm_text_for_filter(s: str) -> str:
     s = html.unescape(s or "")
     s = s.casefold()
     s = s.replace("“", '"').replace("”", '"').replace("’", "'").replace("–", "-")
-    s = re.sub(r"\s+", " ", s)
+    s = _RE_WS.sub(" ", s)
     return s.strip()
 
 
+@functools.lru_cache(maxsize=4096)
 def _norm_doi_for_match(doi: str | None) -> str:
     if not doi:
         return ""
@@ -142,29 +216,25 @@ _MOJIBAKE_REPL = {
 }
 
 
+# Longest keys first so specific sequences win over their prefixes.
+_RE_MOJIBAKE = re.compile("|".join(re.escape(k) for k in sorted(_MOJIBAKE_REPL, key=len, reverse=True)))
+
+
 def _fix_mojibake(s: str) -> str:
     if not s:
         return s
-    out = s
-    for bad, good in _MOJIBAKE_REPL.items():
-        out = out.replace(bad, good)
-    return out
+    return _RE_MOJIBAKE.sub(lambda m: _MOJIBAKE_REPL[m.group(0)], s)
 
 
-def _should_exclude(card: "Card") -> bool:
+def _should_exclude(card: "ParsedCard") -> bool:
     if (card.year or "") in EXCLUDE_YEARS:
         return True
 
-    doi = _norm_doi_for_match(card.doi)
-    if doi and doi in EXCLUDE_DOIS:
+    if card.doi_key and card.doi_key in EXCLUDE_DOIS:
         return True
 
     text = _norm_text_for_filter(" ".join([card.where or "", card.cite or "", card.doi or ""]))
-    for snip in EXCLUDE_TEXT_SNIPPETS:
-        if snip in text:
-            return True
-
-    return False
+    return _RE_EXCLUDE_SNIPPETS.search(text) is not None
 
 
 def _clean_url(u: str | None) -> str | None:
@@ -172,34 +242,25 @@ def _clean_url(u: str | None) -> str | None:
         return None
     u = u.strip()
     # Remove accidental newlines/spaces inside URLs.
-    u = re.sub(r"\s+", "", u)
-    # Undo over-escaped entities (e.g., &amp;amp;).
-    for _ in range(4):
-        new_u = html.unescape(u)
-        if new_u == u:
-            break
-        u = new_u
+    u = _RE_WS.sub("", u)
+    # Undo over-escaped entities (e.g., &amp;amp;): collapse the chain, then
+    # unescape once.
+    if "&" in u:
+        while "&amp;amp;" in u:
+            u = u.replace("&amp;amp;", "&amp;")
+        u = html.unescape(u)
     return u
 
 
-def _bibtex_path_from_href(href: str | None) -> str | None:
-    if not href:
-        return None
-    # publications.html uses relative hrefs like bibtex/<file>.bib
-    href = href.lstrip("/")
-    if not href.startswith("bibtex/"):
-        return None
-    return os.path.join(os.path.dirname(__file__), "..", href)
-
-
-def _parse_bibtex_authors(bibtex_text: str) -> list[str]:
+def _parse_bibtex_authors(bibtex: bytes) -> list[str]:
     # Very small parser: extract the author field without swallowing following fields.
     # Crossref BibTeX can be single-line, so we stop at the first closing brace
     # that is followed by a comma (end of the author field): `author={...},`
-    m = re.search(r"\bauthor\s*=\s*\{(.*?)\}\s*,", bibtex_text, flags=re.S | re.I)
+    # Scan the raw bytes and decode only the author field.
+    m = _RE_BIBTEX_AUTHOR.search(bibtex) or _RE_BIBTEX_AUTHOR_QUOTED.search(bibtex)
     if not m:
         return []
-    raw = m.group(1).strip()
+    raw = m.group(1).decode("utf-8", errors="replace").strip()
     # Split by ' and ' respecting BibTeX semantics.
     parts = [p.strip() for p in raw.split(" and ") if p.strip()]
     out: list[str] = []
@@ -216,26 +277,71 @@ def _parse_bibtex_authors(bibtex_text: str) -> list[str]:
     return out
 
 
-def _authors_from_bibtex_href(bibtex_href: str | None) -> list[str]:
-    path = _bibtex_path_from_href(bibtex_href)
-    if not path or not os.path.exists(path):
+def _build_bibtex_index() -> dict[str, list[str]]:
+    # Parse every BibTeX file once, keyed by the href used in
+    # publications.html (relative, like bibtex/<file>.bib).
+    index: dict[str, list[str]] = {}
+    for path in glob.glob(os.path.join(BIBTEX_DIR, "*.bib")):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except Exception:
+            continue
+        index[f"bibtex/{os.path.basename(path)}"] = _parse_bibtex_authors(data)
+    return index
+
+
+def _authors_from_bibtex_href(bibtex_href: str | None, bibtex_index: dict[str, list[str]]) -> list[str]:
+    if not bibtex_href:
         return []
+    return bibtex_index.get(bibtex_href.lstrip("/"), [])
+
+
+def _load_json_cache(path: str) -> dict:
     try:
-        txt = open(path, "r", encoding="utf-8").read()
+        with open(path, "rb") as f:
+            data = json.loads(f.read())
     except Exception:
-        return []
-    return _parse_bibtex_authors(txt)
+        return {}
+    return data if isinstance(data, dict) else {}
 
 
-def _crossref_best_match(title: str, year: str | None) -> dict | None:
+def _save_json_cache(path: str, data: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    # Serialize in one call and write once; json.dump would issue many small writes.
+    payload = json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def _crossref_best_match(title: str, year: str | None, cache: dict[str, dict] | None = None) -> dict | None:
+    # `cache` maps "<normalized title>|<year>" -> {"fetched_at": ..., "item": ...}.
+    key = f"{_norm(title)}|{year or ''}"
+    hit = cache.get(key) if cache is not None else None
+    if hit and time.time() - hit.get("fetched_at", 0) < CACHE_TTL_S:
+        return hit.get("item")
+
     query = urllib.parse.quote(title)
-    url = f"https://api.crossref.org/works?rows=5&query.bibliographic={query}"
+    mailto = urllib.parse.quote(CROSSREF_MAILTO)
+    url = f"https://api.crossref.org/works?rows=5&query.bibliographic={query}&mailto={mailto}"
     try:
-        data = requests.get(url, timeout=30, headers={"User-Agent": UA}).json()
+        # Parse the raw body; Response.json() decodes to str (with charset
+        # sniffing) first.
+        data = json.loads(_SESSION.get(url, timeout=30).content)
     except Exception:
         return None
 
-    items = data.get("message", {}).get("items", [])
+    best = _crossref_pick(data.get("message", {}).get("items", []), title, year)
+    if cache is not None:
+        # Keep only the fields we use; full Crossref records are large.
+        item = {k: best[k] for k in ("DOI", "title", "author", "issued") if k in best} if best else None
+        cache[key] = {"fetched_at": time.time(), "item": item}
+    return best
+
+
+def _crossref_pick(items: list[dict], title: str, year: str | None) -> dict | None:
     if not items:
         return None
 
@@ -263,8 +369,8 @@ def _crossref_best_match(title: str, year: str | None) -> dict | None:
     return best
 
 
-def _authors_from_crossref(title: str, year: str | None) -> list[str]:
-    item = _crossref_best_match(title, year)
+def _authors_from_crossref(title: str, year: str | None, cache: dict[str, dict] | None = None) -> list[str]:
+    item = _crossref_best_match(title, year, cache)
     if not item:
         return []
     authors = item.get("author")
@@ -282,33 +388,97 @@ def _authors_from_crossref(title: str, year: str | None) -> list[str]:
     return out
 
 
+def _cite_authors_look_complete(cite: str) -> bool:
+    # Scholar truncates long author lists with "..."; otherwise more than three
+    # names before the quoted title means Crossref has nothing to add.
+    authors = extract_authors_from_cite(cite)
+    if not authors or "..." in authors or "…" in authors:
+        return False
+    return sum(1 for a in authors.split(",") if a.strip()) > 3
+
+
+def _prefetch_crossref_authors(
+    cards: list[ParsedCard],
+    bibtex_index: dict[str, list[str]],
+) -> dict[tuple[str, str | None], list[str]]:
+    # Crossref lookups are network-bound: resolve every card that lacks BibTeX
+    # authors up front, concurrently, instead of one round trip per rebuilt card.
+    queries: list[ParsedCard] = []
+    for c in cards:
+        if _should_exclude(c) or not c.year.isdigit():
+            continue
+        if _authors_from_bibtex_href(c.bibtex_url, bibtex_index):
+            continue
+        if _cite_authors_look_complete(c.cite):
+            continue
+        queries.append(c)
+
+    if not queries:
+        return {}
+
+    # Titles that normalize the same (e.g. preprint + journal version) share
+    # a single Crossref query.
+    unique = {(c.title_key, c.year or None): (c.title, c.year or None) for c in queries}
+    cache = _load_json_cache(CROSSREF_CACHE_JSON)
+    with ThreadPoolExecutor(max_workers=CROSSREF_WORKERS) as ex:
+        results = dict(zip(unique, ex.map(lambda q: _authors_from_crossref(*q, cache), unique.values())))
+    _save_json_cache(CROSSREF_CACHE_JSON, cache)
+    return {(c.title, c.year or None): results[(c.title_key, c.year or None)] for c in queries}
+
+
 def _format_author_list(names: list[str]) -> str:
-    names = [re.sub(r"\s+", " ", n).strip() for n in names if n.strip()]
+    names = [_RE_WS.sub(" ", n).strip() for n in names if n.strip()]
     return ", ".join(names)
 
 
 def fetch_rank_map() -> dict[str, str]:
-    r = requests.get(FMARTIN_URL, timeout=30, headers={"User-Agent": UA})
+    # The parsed mapping is cached on disk. Within CACHE_TTL_S it is reused
+    # as-is; afterwards the page is revalidated with ETag/Last-Modified.
+    cached = _load_json_cache(FMARTIN_CACHE_JSON)
+    cached_map = cached.get("rank_map")
+    if isinstance(cached_map, dict) and cached.get("url") == FMARTIN_URL:
+        if time.time() - os.path.getmtime(FMARTIN_CACHE_JSON) < CACHE_TTL_S:
+            return cached_map
+    else:
+        cached = {}
+
+    headers: dict[str, str] = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    r = _SESSION.get(FMARTIN_URL, timeout=30, headers=headers)
+    if r.status_code == 304 and cached:
+        os.utime(FMARTIN_CACHE_JSON)
+        return cached["rank_map"]
     r.raise_for_status()
-    t = r.text
 
+    mapping = _parse_rank_map(r.text)
+    _save_json_cache(
+        FMARTIN_CACHE_JSON,
+        {
+            "url": FMARTIN_URL,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "rank_map": mapping,
+        },
+    )
+    return mapping
+
+
+def _parse_rank_map(t: str) -> dict[str, str]:
     mapping: dict[str, str] = {}
 
     # The page renders entries like:
     # <p>[Journal Q1]<b>"Title"</b> Authors. Venue. 2022.</p>
     # or sometimes a linked title inside the bold section.
-    entry_re = re.compile(
-        r"\[(Journal\s+Q[1-4]|Journal|Class\s+[1-3])\]"  # label
-        r".*?<b>\s*(?:&quot;|\")\s*(.*?)\s*(?:&quot;|\")\s*</b>",
-        flags=re.S,
-    )
-
-    for m in entry_re.finditer(t):
+    for m in _RE_RANK_ENTRY.finditer(t):
         label = m.group(1).strip()
         raw_title = m.group(2).strip()
-        raw_title = re.sub(r"<.*?>", "", raw_title)
+        raw_title = _RE_TAG.sub("", raw_title)
         # If the title is like [Title](url), keep the visible title.
-        raw_title = re.sub(r"\[(.*?)\]\([^)]*\)", r"\1", raw_title)
+        raw_title = _RE_MD_LINK.sub(r"\1", raw_title)
         title = raw_title.strip()
 
         badge = None
@@ -328,7 +498,7 @@ def fetch_rank_map() -> dict[str, str]:
 
 def extract_title_from_cite(cite: str) -> str:
     # Prefer text between curly quotes: “…,”
-    m = re.search(r"[“\"]([^”\"]+)[”\"]", cite)
+    m = _RE_CITE_TITLE.search(cite)
     if m:
         title = m.group(1).strip()
         return title.strip(" ,.;")
@@ -337,80 +507,81 @@ def extract_title_from_cite(cite: str) -> str:
 
 def extract_authors_from_cite(cite: str) -> str:
     # Usually: "AUTHORS, “TITLE,” ..."
-    m = re.search(r"^(.*?),\s*[“\"]", cite)
+    m = _RE_CITE_AUTHORS.search(cite)
     if not m:
         return ""
     return m.group(1).strip()
 
 
-def parse_cards(doc: str) -> list[Card]:
-    cards: list[Card] = []
+def parse_cards(doc: str) -> list[ParsedCard]:
+    cards: list[ParsedCard] = []
 
-    for block in re.findall(r"<article class=\"card pub-card\">.*?</article>", doc, flags=re.S):
-        where = re.search(r"<div class=\"pub-where\">(.*?)</div>", block, flags=re.S)
-        cite = re.search(r"<p class=\"pub-cite\">(.*?)</p>", block, flags=re.S)
-        year = re.search(r"<span class=\"badge\">(\d{4})</span>", block)
-        badge = re.search(r"<span class=\"badge badge-muted\">(.*?)</span>", block, flags=re.S)
+    for article in _RE_ARTICLE.finditer(doc):
+        # Scan the article in place (pos/endpos) instead of copying it out.
+        # First occurrence wins for card fields; links are keyed by their text.
+        fields: dict[str, str] = {}
+        links: dict[str, str] = {}
+        for m in _RE_CARD_FIELD.finditer(doc, article.start(), article.end()):
+            if m["label"] is not None:
+                links[m["label"]] = m["href"]
+                continue
+            for k, v in m.groupdict().items():
+                if v is not None:
+                    fields.setdefault(k, v)
 
-        doi = re.search(r"<p class=\"pub-doi\">\s*DOI:\s*<a[^>]*href=\"([^\"]+)\"[^>]*>(.*?)</a>", block, flags=re.S)
-        doi_url = _clean_url(doi.group(1)) if doi else None
-        doi_txt = html.unescape(doi.group(2)).strip() if doi else None
+        where = fields.get("where")
+        cite = fields.get("cite")
+        doi = fields.get("doi")
+        badge = fields.get("badge")
 
-        links = {
-            m.group(2): _clean_url(m.group(1))
-            for m in re.finditer(r"<a\s+href=\"([^\"]+)\"[^>]*>([^<]+)</a>", block)
-        }
+        cite_txt = _fix_mojibake(html.unescape(_RE_WS.sub(" ", cite)).strip()) if cite is not None else ""
+        doi_txt = _fix_mojibake(html.unescape(doi).strip()) if doi is not None else None
+        title = extract_title_from_cite(cite_txt)
 
         cards.append(
-            Card(
-                year=year.group(1) if year else "",
-                where=html.unescape(where.group(1)).strip() if where else "",
-                cite=html.unescape(re.sub(r"\s+", " ", cite.group(1))).strip() if cite else "",
-                doi=doi_txt,
-                doi_url=doi_url,
+            ParsedCard(
+                year=fields.get("year", ""),
+                where=_fix_mojibake(html.unescape(where).strip()) if where is not None else "",
+                cite=cite_txt,
+                doi=doi_txt or None,
+                doi_url=_clean_url(fields.get("doi_url")),
                 scholar_url=_clean_url(links.get("Scholar")),
                 bibtex_url=_clean_url(links.get("BibTeX")),
                 link_url=_clean_url(links.get("Link")),
                 paper_url=_clean_url(links.get("Paper")),
-                badge=html.unescape(badge.group(1)).strip() if badge else "Q?",
+                badge=_fix_mojibake(html.unescape(badge).strip()) if badge is not None else "Q?",
+                title=title,
+                title_key=_norm(title),
+                doi_key=_norm_doi_for_match(doi_txt),
             )
         )
 
     return cards
 
 
-def rebuild_card(card: Card, rank_map: dict[str, str]) -> str:
-    card = Card(
-        year=card.year,
-        where=_fix_mojibake(card.where),
-        cite=_fix_mojibake(card.cite),
-        doi=_fix_mojibake(card.doi) if card.doi else None,
-        doi_url=card.doi_url,
-        scholar_url=card.scholar_url,
-        bibtex_url=card.bibtex_url,
-        link_url=card.link_url,
-        paper_url=card.paper_url,
-        badge=_fix_mojibake(card.badge),
-    )
-
+def rebuild_card(
+    card: ParsedCard,
+    rank_map: dict[str, str],
+    bibtex_index: dict[str, list[str]],
+    crossref_authors: dict[tuple[str, str | None], list[str]],
+    out: list[str],
+) -> None:
+    # Appends the card's lines to `out`; the caller joins everything once.
     badge_value = card.badge or "Q?"
 
-    doi_norm = _norm_doi_for_match(card.doi)
-    doi_override = DOI_RANK_OVERRIDES.get(doi_norm)
+    doi_override = DOI_RANK_OVERRIDES.get(card.doi_key)
     if doi_override:
         badge_value = doi_override
 
     # Apply manual overrides first.
-    title_for_rank = extract_title_from_cite(card.cite)
-    manual = MANUAL_RANKS.get(_norm(title_for_rank))
+    manual = MANUAL_RANKS.get(card.title_key)
     if manual:
         badge_value = manual
 
     # Apply rank map only for year <= 2022 (2023+ left for manual updates).
     if card.year.isdigit() and int(card.year) <= 2022:
-        key = _norm(title_for_rank)
-        if key in rank_map:
-            badge_value = rank_map[key]
+        if card.title_key in rank_map:
+            badge_value = rank_map[card.title_key]
 
     if badge_value == "Q?":
         badge_value = ""
@@ -437,10 +608,10 @@ def rebuild_card(card: Card, rank_map: dict[str, str]) -> str:
         paper_url = link_url or card.doi_url or card.scholar_url or "#"
 
     # Expand authors list (no ellipsis) using BibTeX first, then Crossref.
-    title = title_for_rank
-    authors_list = _authors_from_bibtex_href(card.bibtex_url)
+    title = card.title
+    authors_list = _authors_from_bibtex_href(card.bibtex_url, bibtex_index)
     if not authors_list:
-        authors_list = _authors_from_crossref(title, card.year if card.year else None)
+        authors_list = crossref_authors.get((title, card.year if card.year else None), [])
     authors_list = [_fix_mojibake(a) for a in authors_list]
 
     cite_authors = _format_author_list(authors_list) if authors_list else extract_authors_from_cite(card.cite)
@@ -451,79 +622,90 @@ def rebuild_card(card: Card, rank_map: dict[str, str]) -> str:
         # Rebuild a consistent IEEE-like line with full authors.
         cite_line = f"{cite_authors}, “{title},” {card.where}.".strip()
 
-    parts: list[str] = []
-    parts.append('      <article class="card pub-card">')
-    parts.append('        <div class="pub-top">')
-    parts.append(f'          <div class="pub-where">{html.escape(card.where)}</div>')
-    parts.append('          <div class="badges">')
+    out.append('      <article class="card pub-card">')
+    out.append('        <div class="pub-top">')
+    out.append(f'          <div class="pub-where">{html.escape(card.where)}</div>')
+    out.append('          <div class="badges">')
     if card.year:
-        parts.append(f'            <span class="badge">{html.escape(card.year)}</span>')
+        out.append(f'            <span class="badge">{html.escape(card.year)}</span>')
     if badge_value:
-        parts.append(f'            <span class="badge badge-muted">{html.escape(badge_value)}</span>')
-    parts.append('          </div>')
-    parts.append('        </div>')
-    parts.append(f'        <p class="pub-cite">{html.escape(cite_line)}</p>')
+        out.append(f'            <span class="badge badge-muted">{html.escape(badge_value)}</span>')
+    out.append('          </div>')
+    out.append('        </div>')
+    out.append(f'        <p class="pub-cite">{html.escape(cite_line)}</p>')
     if card.doi and doi_url:
-        parts.append(
+        out.append(
             '        <p class="pub-doi">DOI: '
             f'<a href="{html.escape(doi_url, quote=True)}">{html.escape(card.doi)}</a></p>'
         )
 
-    parts.append('        <div class="pub-links">')
+    out.append('        <div class="pub-links">')
     if link_url:
-        parts.append(f'          <a href="{html.escape(link_url, quote=True)}">Link</a>')
+        out.append(f'          <a href="{html.escape(link_url, quote=True)}">Link</a>')
     if card.scholar_url:
-        parts.append(f'          <a href="{html.escape(card.scholar_url, quote=True)}">Scholar</a>')
+        out.append(f'          <a href="{html.escape(card.scholar_url, quote=True)}">Scholar</a>')
     if card.bibtex_url:
-        parts.append(f'          <a href="{html.escape(card.bibtex_url, quote=True)}" download>BibTeX</a>')
+        out.append(f'          <a href="{html.escape(card.bibtex_url, quote=True)}" download>BibTeX</a>')
     else:
-        parts.append('          <a href="#">BibTeX</a>')
-    parts.append(f'          <a href="{html.escape(paper_url, quote=True)}">Paper</a>')
-    parts.append('          <a href="#">Video</a>')
-    parts.append('        </div>')
-    parts.append('      </article>')
-
-    return "\n".join(parts)
-
-
-def _render_list(cards: list[Card], rank_map: dict[str, str]) -> str:
-    kept: list[Card] = [c for c in cards if not _should_exclude(c)]
-
-    by_year: dict[str, list[str]] = {}
+        out.append('          <a href="#">BibTeX</a>')
+    out.append(f'          <a href="{html.escape(paper_url, quote=True)}">Paper</a>')
+    out.append('          <a href="#">Video</a>')
+    out.append('        </div>')
+    out.append('      </article>')
+
+
+def _render_list(
+    cards: list[ParsedCard],
+    rank_map: dict[str, str],
+    bibtex_index: dict[str, list[str]],
+    crossref_authors: dict[tuple[str, str | None], list[str]],
+) -> str:
+    kept: list[ParsedCard] = [c for c in cards if not _should_exclude(c)]
+
+    by_year: dict[str, list[ParsedCard]] = {}
     for c in kept:
         if not c.year or not c.year.isdigit():
             continue
         if c.year in EXCLUDE_YEARS:
             continue
-        by_year.setdefault(c.year, []).append(rebuild_card(c, rank_map))
+        by_year.setdefault(c.year, []).append(c)
 
     years_sorted = sorted(by_year.keys(), key=lambda y: int(y), reverse=True)
-    parts: list[str] = []
+    lines: list[str] = []
     for y in years_sorted:
-        items = by_year.get(y) or []
-        if not items:
-            continue
-        parts.append(f'    <h3 class="pub-year">{html.escape(y)}</h3>')
-        parts.append('    <div class="pub-list">')
-        parts.append("\n".join(items))
-        parts.append('    </div>')
-    return "\n".join(parts) + "\n"
+        lines.append(f'    <h3 class="pub-year">{html.escape(y)}</h3>')
+        lines.append('    <div class="pub-list">')
+        for c in by_year[y]:
+            rebuild_card(c, rank_map, bibtex_index, crossref_authors, lines)
+        lines.append('    </div>')
+    return "\n".join(lines) + "\n"
 
 
 def main() -> None:
     path = "publications.html"
-    doc = open(path, "r", encoding="utf-8").read()
-
-    rank_map = fetch_rank_map()
-    cards = parse_cards(doc)
-
-    new_list = _render_list(cards, rank_map)
-    m = re.search(r"(<section>\s*<h2>List</h2>\s*)(.*?)(\s*</section>)", doc, flags=re.S)
-    if not m:
-        raise SystemExit("Could not find publications List section")
-    new_doc = doc[: m.start(2)] + new_list + doc[m.end(2) :]
-
-    open(path, "w", encoding="utf-8").write(new_doc)
+    with open(path, "r", encoding="utf-8") as f:
+        doc = f.read()
+
+    # The fmartin fetch is independent of the local parsing and Crossref work.
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        fut_rank_map = ex.submit(fetch_rank_map)
+        cards = parse_cards(doc)
+        bibtex_index = _build_bibtex_index()
+        crossref_authors = _prefetch_crossref_authors(cards, bibtex_index)
+        rank_map = fut_rank_map.result()
+
+    new_list = _render_list(cards, rank_map, bibtex_index, crossref_authors)
+    begin = doc.find(PUB_LIST_BEGIN)
+    end = doc.find(PUB_LIST_END, begin)
+    if begin < 0 or end < 0:
+        raise SystemExit("Could not find publications list markers")
+    # Replace the lines strictly between the two marker lines.
+    start = doc.find("\n", begin) + 1
+    stop = doc.rfind("\n", 0, end) + 1
+    new_doc = doc[:start] + new_list + doc[stop:]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(new_doc)
 
     removed = sum(1 for c in cards if _should_exclude(c))
     print(f"Parsed {len(cards)} cards")
@@ -17,11 +17,15 @@ Cards mimic publications style; badge shows year interval.
 from __future__ import annotations
 
 import datetime as dt
+import functools
 import html
 import json
 import os
 import re
+import string
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from html.parser import HTMLParser
 
 import requests
 
@@ -30,6 +34,7 @@ URJC_URL = "https://servicios.urjc.es/pdi/ver/francisco.rico"
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 OUT_HTML = os.path.join(ROOT_DIR, "projects.html")
 PROJECT_LINKS_JSON = os.path.join(os.path.dirname(__file__), "project_links.json")
+PROJECTS_TEMPLATE = os.path.join(os.path.dirname(__file__), "templates", "projects.html.tmpl")
 
 
 EXCLUDE_COMPETITIVE_TITLES = {
@@ -61,6 +66,9 @@ OPEN_SOURCE = [
 ]
 
 
+_RE_WS = re.compile(r"\s+")
+
+
 @dataclass
 class CompetitiveProject:
     title: str
@@ -76,18 +84,15 @@ def _session() -> requests.Session:
     return s
 
 
-def _strip_tags(s: str) -> str:
-    s = re.sub(r"<br\s*/?>", "\n", s, flags=re.I)
-    s = re.sub(r"<[^>]+>", "", s)
-    s = html.unescape(s)
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
+def _clean_text(s: str) -> str:
+    return _RE_WS.sub(" ", s).strip()
 
 
+@functools.lru_cache(maxsize=1024)
 def _norm_title(s: str) -> str:
     s = html.unescape(s)
     s = s.strip().lower()
-    s = re.sub(r"\s+", " ", s)
+    s = _RE_WS.sub(" ", s)
     s = s.strip(" .,:;\t\n\r")
     return s
 
@@ -96,8 +101,8 @@ def load_project_links() -> dict[str, str]:
     if not os.path.exists(PROJECT_LINKS_JSON):
         return {}
     try:
-        with open(PROJECT_LINKS_JSON, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        with open(PROJECT_LINKS_JSON, "rb") as f:
+            raw = json.loads(f.read())
     except Exception:
         return {}
 
@@ -115,25 +120,152 @@ def load_project_links() -> dict[str, str]:
     return out
 
 
-def _field_value(panel: str, label: str) -> str:
-    m = re.search(rf"<b>\s*{re.escape(label)}\s*:</b>\s*([^<]*)", panel, flags=re.S | re.I)
-    return _strip_tags(m.group(1)) if m else ""
+class _ProjectsParser(HTMLParser):
+    """Single pass over the URJC PDI page, collecting the Proyectos tab panels.
+
+    Each `div.panel.panel-default` inside `#tab_proyectos` is one project: the
+    title is the `a.accordion-toggle` text, scalar fields are the text right
+    after a `<b>Label:</b>`, and list fields are the `<li>` items of the first
+    `<ul>` following their label.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.projects: list[CompetitiveProject] = []
+        self._div_depth = 0
+        self._tab_depth: int | None = None
+        self._done = False
+        self._panel_depth: int | None = None
+        self._title = ""
+        self._fields: dict[str, str] = {}
+        self._lists: dict[str, list[str]] = {}
+        # What the text buffer is being collected for: title/label/value/li.
+        self._capture: str | None = None
+        self._buf: list[str] = []
+        self._label = ""
+        self._ul_label: str | None = None
+        self._ul_items: list[str] | None = None
+
+    def _start_capture(self, kind: str) -> None:
+        self._capture = kind
+        self._buf = []
+
+    def _end_value(self) -> None:
+        if self._capture == "value":
+            self._fields.setdefault(self._label, _clean_text("".join(self._buf)))
+            self._capture = None
+
+    def _end_li(self) -> None:
+        # Also called on a new <li> or </ul>, so unclosed items still count.
+        if self._capture == "li":
+            item = _clean_text("".join(self._buf))
+            if item and self._ul_items is not None:
+                self._ul_items.append(item)
+            self._capture = None
+
+    def _finish_panel(self) -> None:
+        if self._panel_depth is not None and self._title:
+            self.projects.append(
+                CompetitiveProject(
+                    title=self._title,
+                    start=self._fields.get("fecha inicio", ""),
+                    end=self._fields.get("fecha fin", ""),
+                    funder=self._fields.get("entidad financiadora", ""),
+                    pis=self._lists.get("investigador/es principal/es", []),
+                )
+            )
+        self._panel_depth = None
+        self._title = ""
+        self._fields = {}
+        self._lists = {}
+        self._capture = None
+        self._ul_label = None
+        self._ul_items = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._done:
+            return
+        a = dict(attrs)
+        if tag == "div":
+            # Like any tag, a div ends a scalar value (`<b>Label:</b> value</div>`).
+            self._end_value()
+            self._div_depth += 1
+            if a.get("id") == "tab_publicaciones":
+                self._finish_panel()
+                self._done = True
+            elif a.get("id") == "tab_proyectos":
+                self._tab_depth = self._div_depth
+            elif self._tab_depth is not None and {"panel", "panel-default"} <= set((a.get("class") or "").split()):
+                self._finish_panel()
+                self._panel_depth = self._div_depth
+            return
+        if self._panel_depth is None:
+            return
+
+        if tag == "li":
+            self._end_li()
+        if self._capture in ("title", "li"):
+            # Inner markup of a title or list item only contributes its text.
+            if tag == "br":
+                self._buf.append("\n")
+            return
+        self._end_value()
+
+        if tag == "a" and not self._title and "accordion-toggle" in (a.get("class") or "").split():
+            self._start_capture("title")
+        elif tag == "b":
+            self._start_capture("label")
+        elif tag == "ul" and self._ul_label is not None and self._ul_items is None:
+            self._ul_items = []
+        elif tag == "li" and self._ul_items is not None:
+            self._start_capture("li")
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._done:
+            return
+        if tag == "div":
+            self._end_value()
+            if self._div_depth == self._panel_depth:
+                self._finish_panel()
+            if self._div_depth == self._tab_depth:
+                self._tab_depth = None
+            self._div_depth -= 1
+            return
+        if self._panel_depth is None:
+            return
+
+        if tag == "a" and self._capture == "title":
+            self._title = _clean_text("".join(self._buf))
+            self._capture = None
+        elif tag in ("li", "ul") and self._capture == "li":
+            self._end_li()
+            if tag == "ul":
+                self.handle_endtag(tag)
+        elif self._capture in ("title", "li"):
+            return
+        elif tag == "b" and self._capture == "label":
+            self._label = _clean_text("".join(self._buf)).rstrip(":").strip().casefold()
+            self._ul_label = self._label
+            self._ul_items = None
+            self._start_capture("value")
+        elif tag == "ul" and self._ul_items is not None and self._ul_label is not None:
+            self._lists.setdefault(self._ul_label, self._ul_items)
+            self._ul_label = None
+            self._ul_items = None
+        else:
+            self._end_value()
 
+    def handle_data(self, data: str) -> None:
+        if self._capture is not None:
+            self._buf.append(data)
 
-def _ul_after_label(panel: str, label: str) -> list[str]:
-    # Find first <ul>...</ul> after a <b>label:</b>
-    m = re.search(rf"<b>\s*{re.escape(label)}\s*:</b>\s*(?:</p>)?\s*<ul>(.*?)</ul>", panel, flags=re.S | re.I)
-    if not m:
-        return []
-    ul = m.group(1)
-    items = []
-    for li in re.findall(r"<li[^>]*>(.*?)</li>", ul, flags=re.S | re.I):
-        t = _strip_tags(li)
-        if t:
-            items.append(t)
-    return items
+    def close(self) -> None:
+        super().close()
+        if not self._done:
+            self._finish_panel()
 
 
+@functools.lru_cache(maxsize=1024)
 def _parse_date(s: str) -> dt.date | None:
     s = s.strip()
     if not s:
@@ -167,30 +299,12 @@ def fetch_competitive_projects() -> list[CompetitiveProject]:
     s = _session()
     page = s.get(URJC_URL, timeout=30).text
 
-    m = re.search(r'<div[^>]+id="tab_proyectos"[^>]*>(.*?)<div[^>]+id="tab_publicaciones"', page, flags=re.S)
-    if not m:
-        return []
-    sec = m.group(1)
-
-    panels = sec.split('<div class="panel panel-default">')
-    out: list[CompetitiveProject] = []
-
-    for chunk in panels[1:]:
-        title_m = re.search(r'<a class="accordion-toggle"[^>]*>\s*(.*?)\s*</a>', chunk, flags=re.S)
-        if not title_m:
-            continue
-        title = _strip_tags(title_m.group(1))
-
-        start = _field_value(chunk, "Fecha inicio")
-        end = _field_value(chunk, "Fecha fin")
-        funder = _field_value(chunk, "Entidad financiadora")
-        pis = _ul_after_label(chunk, "Investigador/es principal/es")
-
-        if title:
-            out.append(CompetitiveProject(title=title, start=start, end=end, funder=funder, pis=pis))
+    parser = _ProjectsParser()
+    parser.feed(page)
+    parser.close()
 
     # Keep order as URJC provides (appears most recent first)
-    return out
+    return parser.projects
 
 
 def split_ongoing_past(projects: list[CompetitiveProject]) -> tuple[list[CompetitiveProject], list[CompetitiveProject]]:
@@ -266,108 +380,25 @@ def render_open_source_cards() -> str:
 
 def write_projects_page(ongoing_html: str, oss_html: str, past_html: str) -> None:
     year = dt.date.today().year
-    doc = f"""<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-  <meta charset=\"utf-8\" />
-  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-  <title>Projects – Francisco Martín Rico</title>
-    <meta name=\"description\" content=\"Projects by Francisco Martín Rico (competitive research projects and open source software).\" />
-  <meta name=\"robots\" content=\"index, follow\" />
-    <meta name=\"author\" content=\"Francisco Martín Rico\" />
-    <link rel=\"canonical\" href=\"https://fmrico.github.io/projects.html\" />
-    <link rel=\"icon\" href=\"img/fmrico.png\" type=\"image/png\" />
-
-    <meta property=\"og:site_name\" content=\"Francisco Martín Rico\" />
-    <meta property=\"og:type\" content=\"website\" />
-    <meta property=\"og:title\" content=\"Projects – Francisco Martín Rico\" />
-    <meta property=\"og:description\" content=\"Competitive research projects and open source projects by Francisco Martín Rico.\" />
-    <meta property=\"og:url\" content=\"https://fmrico.github.io/projects.html\" />
-    <meta property=\"og:image\" content=\"https://fmrico.github.io/img/fmrico.png\" />
-
-    <meta name=\"twitter:card\" content=\"summary\" />
-    <meta name=\"twitter:title\" content=\"Projects – Francisco Martín Rico\" />
-    <meta name=\"twitter:description\" content=\"Competitive research projects and open source projects by Francisco Martín Rico.\" />
-    <meta name=\"twitter:image\" content=\"https://fmrico.github.io/img/fmrico.png\" />
-    <meta name=\"twitter:site\" content=\"@fmrico\" />
-
-    <script type=\"application/ld+json\">
-    {{
-        \"@context\": \"https://schema.org\",
-        \"@type\": \"CollectionPage\",
-        \"name\": \"Projects – Francisco Martín Rico\",
-        \"url\": \"https://fmrico.github.io/projects.html\",
-        \"about\": {{
-            \"@type\": \"Person\",
-            \"name\": \"Francisco Martín Rico\",
-            \"url\": \"https://fmrico.github.io/\"
-        }}
-    }}
-    </script>
-  <link rel=\"stylesheet\" href=\"styles.css\" />
-</head>
-<body>
-
-<header>
-  <div class=\"topbar\">
-    <div class=\"brand\">
-      <p class=\"brand-title\">Francisco Martín Rico</p>
-      <p class=\"brand-subtitle\">Academic homepage</p>
-    </div>
-    <nav class=\"nav\" aria-label=\"Primary\">
-      <a href=\"index.html\">Home</a>
-      <a href=\"publications.html\">Publications</a>
-      <a href=\"projects.html\" aria-current=\"page\">Projects</a>
-    </nav>
-  </div>
-</header>
-
-<main>
-  <div class=\"hero\">
-    <div>
-      <h1>Projects</h1>
-    </div>
-  </div>
-
-  <section>
-    <h2>Competitive projects (ongoing)</h2>
-    {ongoing_html}
-  </section>
-
-  <section>
-    <h2>Open source projects</h2>
-    {oss_html}
-  </section>
-
-  <section>
-    <h2>Competitive projects (past)</h2>
-    {past_html}
-  </section>
-</main>
-
-<footer>
-  <div class=\"footer-inner\">
-    <p>© {year} Francisco Martín Rico</p>
-  </div>
-</footer>
-
-</body>
-</html>
-"""
+    with open(PROJECTS_TEMPLATE, "r", encoding="utf-8") as f:
+        tmpl = string.Template(f.read())
+    doc = tmpl.substitute(year=year, ongoing_html=ongoing_html, oss_html=oss_html, past_html=past_html)
 
     with open(OUT_HTML, "w", encoding="utf-8") as f:
         f.write(doc)
 
 
 def main() -> None:
-    projects = fetch_competitive_projects()
-    ongoing, past = split_ongoing_past(projects)
-
-    project_links = load_project_links()
+    # Overlap the URJC fetch with the local work that does not depend on it.
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        fut_projects = ex.submit(fetch_competitive_projects)
+        project_links = load_project_links()
+        oss_html = render_open_source_cards()
+        projects = fut_projects.result()
 
+    ongoing, past = split_ongoing_past(projects)
     ongoing_html = render_competitive_cards(ongoing, project_links)
     past_html = render_competitive_cards(past, project_links)
-    oss_html = render_open_source_cards()
 
     write_projects_page(ongoing_html, oss_html, past_html)
     print(f"Wrote {OUT_HTML}")
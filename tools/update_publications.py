@@ -10,16 +10,26 @@ This script is intentionally dependency-free (requests only).
 
 from __future__ import annotations
 
+import argparse
+import functools
 import hashlib
 import html
+import io
+import json
 import os
 import re
+import string
+import threading
 import time
 import urllib.parse
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Iterable
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 SCHOLAR_USER = "5e4caiwAAAAJ"
 SCHOLAR_HL = "es"
@@ -28,9 +38,73 @@ PAGESIZE = 100
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 OUT_HTML = os.path.join(ROOT_DIR, "publications.html")
 BIB_DIR = os.path.join(ROOT_DIR, "bibtex")
+COMBINED_BIB = os.path.join(ROOT_DIR, "bibtex.bib")
+PUBLICATIONS_TEMPLATE = os.path.join(os.path.dirname(__file__), "templates", "publications.html.tmpl")
+HTTP_CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache", "http")
+HTTP_CACHE_TTL_S = 7 * 24 * 3600
 
 UA = "fmrico.github.io/1.0 (mailto:francisco.rico@urjc.es)"
 
+# Enrichment is network-bound and runs on a thread pool; each host gets its
+# own concurrency cap (Scholar is far less tolerant than Crossref).
+CROSSREF_WORKERS = 8
+SCHOLAR_WORKERS = 2
+# BibTeX files are written off the enrichment loop so disk I/O overlaps network.
+WRITER_WORKERS = 4
+_CROSSREF_SLOTS = threading.BoundedSemaphore(CROSSREF_WORKERS)
+_SCHOLAR_SLOTS = threading.BoundedSemaphore(SCHOLAR_WORKERS)
+
+# Scholar profile/detail scraping.
+_RE_ROW = re.compile(r"<tr class=\"gsc_a_tr\".*?</tr>", re.S)
+# One pass per row: title link, the gray author/venue lines, and the year.
+_RE_ROW_FIELD = re.compile(
+    r"<a(?P<a_attrs>[^>]*class=\"gsc_a_at\"[^>]*)>(?P<title>.*?)</a>"
+    r"|<div class=\"gs_gray\">(?P<gray>.*?)</div>"
+    r"|class=\"gsc_a_y\"[^>]*>\s*<span[^>]*>(?P<year>\d{4})</span>",
+    re.S,
+)
+_RE_HREF = re.compile(r"href=\"([^\"]+)\"", re.S)
+_RE_DETAIL_LINK = re.compile(r"class=\"gsc_oci_title_link\"[^>]*href=\"([^\"]+)\"", re.S)
+
+_RE_STRIP_TAGS = re.compile(r"<[^>]*>")
+_RE_WS = re.compile(r"\s+")
+_RE_NUL_RUN = re.compile("\0+")
+_RE_BIB_KEY = re.compile(r"[^A-Za-z0-9]+")
+_RE_BIB_ENTRY_KEY = re.compile(r"(\s*@\w+\s*\{\s*)([^,\s]+)")
+
+
+class _KeepTable(dict):
+    """str.translate table that keeps `keep` and maps any other char to `repl`.
+
+    Entries are filled in lazily, once per distinct code point, so the table
+    covers all of Unicode without being built up front.
+    """
+
+    def __init__(self, keep: str, repl: str) -> None:
+        super().__init__()
+        self._keep = frozenset(keep)
+        self._repl = repl
+
+    def __missing__(self, cp: int) -> int | str:
+        v = cp if chr(cp) in self._keep else self._repl
+        self[cp] = v
+        return v
+
+
+_ALNUM = string.ascii_lowercase + string.digits
+_TITLE_TRANS = _KeepTable(_ALNUM, " ")
+# Unsafe chars become NUL so runs of them can be collapsed to a single "_".
+_DOI_TRANS = _KeepTable(_ALNUM + "._-", "\0")
+
+# Crossref work type -> (BibTeX entry type, field holding container-title).
+_BIBTEX_TYPES = {
+    "journal-article": ("article", "journal"),
+    "proceedings-article": ("inproceedings", "booktitle"),
+    "book-chapter": ("incollection", "booktitle"),
+    "book": ("book", None),
+}
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
 
 @dataclass(frozen=True)
 class Pub:
@@ -52,8 +126,14 @@ class EnrichedPub:
 
 
 def _session() -> requests.Session:
+    # One keep-alive pool per host, sized for the enrichment workers, so the
+    # whole run reuses a handful of TLS connections; retry transient failures.
     s = requests.Session()
     s.headers.update({"User-Agent": UA})
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=CROSSREF_WORKERS, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     return s
 
 
@@ -65,6 +145,80 @@ def _get_text(s: requests.Session, url: str, *, sleep_s: float = 0.0) -> str:
     return r.text
 
 
+class HttpCache:
+    """Filesystem cache of GET responses keyed by sha1(url).
+
+    Entries younger than the TTL are served without touching the network;
+    older ones are revalidated with If-None-Match/If-Modified-Since. Only 200
+    responses are stored. With refresh=True cached entries are ignored (but
+    still overwritten with the fresh response).
+    """
+
+    def __init__(self, root: str, ttl_s: float = HTTP_CACHE_TTL_S, refresh: bool = False) -> None:
+        self.root = root
+        self.ttl_s = ttl_s
+        self.refresh = refresh
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, f"{h}.json"), os.path.join(self.root, f"{h}.body")
+
+    def _store(self, url: str, meta: dict, body: bytes | None) -> None:
+        meta_path, body_path = self._paths(url)
+        os.makedirs(self.root, exist_ok=True)
+        suffix = f".{threading.get_ident()}.tmp"
+        if body is not None:
+            with open(body_path + suffix, "wb") as f:
+                f.write(body)
+            os.replace(body_path + suffix, body_path)
+        with open(meta_path + suffix, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + suffix, meta_path)
+
+    def get(self, s: requests.Session, url: str, *, sleep_s: float = 0.0) -> tuple[int, bytes]:
+        meta_path, body_path = self._paths(url)
+        meta: dict | None = None
+        body = b""
+        if not self.refresh:
+            try:
+                with open(meta_path, "rb") as f:
+                    meta = json.loads(f.read())
+                with open(body_path, "rb") as f:
+                    body = f.read()
+            except Exception:
+                meta = None
+        if meta and time.time() - meta.get("fetched_at", 0) < self.ttl_s:
+            return 200, body
+
+        headers: dict[str, str] = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        if sleep_s:
+            time.sleep(sleep_s)
+        r = s.get(url, timeout=30, headers=headers)
+        if r.status_code == 304 and meta:
+            meta["fetched_at"] = time.time()
+            self._store(url, meta, None)
+            return 200, body
+        if r.status_code == 200:
+            meta = {
+                "url": url,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }
+            self._store(url, meta, r.content)
+        return r.status_code, r.content
+
+
+def _clean(s: str) -> str:
+    # Markup fragment -> plain text with collapsed whitespace.
+    return _RE_WS.sub(" ", html.unescape(_RE_STRIP_TAGS.sub("", s))).strip()
+
+
 def _abs_scholar_url(href: str) -> str:
     href = href.replace("&amp;", "&")
     if href.startswith("http"):
@@ -72,56 +226,71 @@ def _abs_scholar_url(href: str) -> str:
     return "https://scholar.google.com" + href
 
 
-def _extract_first(pattern: str, text: str) -> str | None:
-    m = re.search(pattern, text, flags=re.S)
-    return m.group(1) if m else None
-
-
-def _parse_profile_rows(profile_html: str) -> list[Pub]:
+def _parse_profile_rows(profile_html: str) -> tuple[list[Pub], int]:
+    # Also returns the raw row count: rows without a usable title link are
+    # skipped, so len(pubs) alone can't tell a full page from the last one.
     pubs: list[Pub] = []
-
-    for row in re.findall(r"<tr class=\"gsc_a_tr\".*?</tr>", profile_html, flags=re.S):
-        a_tag = _extract_first(r"(<a[^>]*class=\"gsc_a_at\"[^>]*>.*?</a>)", row)
-        if not a_tag:
+    n_rows = 0
+
+    for row in _RE_ROW.finditer(profile_html):
+        n_rows += 1
+        a_attrs: str | None = None
+        raw_title = ""
+        grays: list[str] = []
+        year = ""
+        for m in _RE_ROW_FIELD.finditer(profile_html, row.start(), row.end()):
+            if m["a_attrs"] is not None:
+                if a_attrs is None:
+                    a_attrs, raw_title = m["a_attrs"], m["title"]
+            elif m["gray"] is not None:
+                grays.append(m["gray"])
+            elif not year:
+                year = m["year"]
+        if a_attrs is None:
             continue
-        href = _extract_first(r"href=\"([^\"]+)\"", a_tag)
-        title = _extract_first(r"class=\"gsc_a_at\"[^>]*>(.*?)</a>", a_tag)
-        if not href or title is None:
+        href_m = _RE_HREF.search(a_attrs)
+        if not href_m:
             continue
 
-        title = html.unescape(re.sub(r"<.*?>", "", title)).strip()
-        scholar_url = _abs_scholar_url(href)
-
-        grays = re.findall(r"<div class=\"gs_gray\">(.*?)</div>", row, flags=re.S)
-        authors = html.unescape(re.sub(r"<.*?>", "", grays[0])).strip() if len(grays) >= 1 else ""
-        venue = html.unescape(re.sub(r"<.*?>", "", grays[1])).strip() if len(grays) >= 2 else ""
-        venue = re.sub(r"\s+", " ", venue)
+        title = _clean(raw_title)
+        scholar_url = _abs_scholar_url(href_m.group(1))
 
-        year = _extract_first(r"class=\"gsc_a_y\"[^>]*>\s*<span[^>]*>(\d{4})</span>", row) or ""
+        authors = _clean(grays[0]) if len(grays) >= 1 else ""
+        venue = _clean(grays[1]) if len(grays) >= 2 else ""
 
         pubs.append(Pub(title=title, authors=authors, venue=venue, year=year, scholar_url=scholar_url))
 
-    return pubs
+    return pubs, n_rows
 
 
 def fetch_scholar_publications(s: requests.Session) -> list[Pub]:
     all_pubs: list[Pub] = []
+    prev_page: tuple[tuple[str, str, str], ...] | None = None
     for cstart in range(0, 5000, PAGESIZE):
         url = (
             f"https://scholar.google.com/citations?user={SCHOLAR_USER}"
             f"&hl={SCHOLAR_HL}&cstart={cstart}&pagesize={PAGESIZE}"
         )
         html_text = _get_text(s, url, sleep_s=1.0 if cstart else 0.0)
-        pubs = _parse_profile_rows(html_text)
+        pubs, n_rows = _parse_profile_rows(html_text)
         if not pubs:
             break
+        # Past the end Scholar sometimes serves the last page again. Compare
+        # parsed rows, not raw HTML, which can carry per-request tokens.
+        page = tuple((p.title, p.year, p.scholar_url) for p in pubs)
+        if page == prev_page:
+            break
+        prev_page = page
         all_pubs.extend(pubs)
+        if n_rows < PAGESIZE:
+            break
 
-    # Deduplicate by (title, year)
+    # Deduplicate by (normalized title, year); _norm_title is memoized and the
+    # same keys are reused for the Crossref lookups.
     seen: set[tuple[str, str]] = set()
     deduped: list[Pub] = []
     for p in all_pubs:
-        key = (p.title.casefold(), p.year)
+        key = (_norm_title(p.title), p.year)
         if key in seen:
             continue
         seen.add(key)
@@ -130,29 +299,34 @@ def fetch_scholar_publications(s: requests.Session) -> list[Pub]:
     return deduped
 
 
-def fetch_scholar_external_link(s: requests.Session, scholar_url: str) -> str | None:
+def fetch_scholar_external_link(s: requests.Session, cache: HttpCache, scholar_url: str) -> str | None:
     try:
-        detail_html = _get_text(s, scholar_url, sleep_s=0.8)
+        with _SCHOLAR_SLOTS:
+            status, body = cache.get(s, scholar_url, sleep_s=0.8)
     except Exception:
         return None
+    if status != 200:
+        return None
+    detail_html = body.decode("utf-8", errors="replace")
 
-    link = _extract_first(r"class=\"gsc_oci_title_link\"[^>]*href=\"([^\"]+)\"", detail_html)
-    if not link:
+    m = _RE_DETAIL_LINK.search(detail_html)
+    if not m:
         return None
-    return html.unescape(link)
+    return html.unescape(m.group(1))
 
 
+@functools.lru_cache(maxsize=4096)
 def _norm_title(t: str) -> str:
-    t = t.casefold()
-    t = re.sub(r"[^a-z0-9]+", " ", t)
-    return re.sub(r"\s+", " ", t).strip()
+    return " ".join(t.casefold().translate(_TITLE_TRANS).split())
 
 
-def crossref_best_match(s: requests.Session, title: str, year: str) -> dict | None:
+def crossref_best_match(s: requests.Session, cache: HttpCache, title: str, year: str) -> dict | None:
     query = urllib.parse.quote(title)
     url = f"https://api.crossref.org/works?rows=5&query.bibliographic={query}"
     try:
-        data = s.get(url, timeout=30, headers={"User-Agent": UA}).json()
+        with _CROSSREF_SLOTS:
+            _, body = cache.get(s, url)
+        data = json.loads(body)
     except Exception:
         return None
 
@@ -160,7 +334,7 @@ def crossref_best_match(s: requests.Session, title: str, year: str) -> dict | No
     if not items:
         return None
 
-    want = _norm_title(title)
+    want_set = frozenset(_norm_title(title).split())
 
     def score(it: dict) -> float:
         cand_title = (it.get("title") or [""])[0]
@@ -168,7 +342,6 @@ def crossref_best_match(s: requests.Session, title: str, year: str) -> dict | No
         if not cand:
             return 0.0
         # simple overlap score
-        want_set = set(want.split())
         cand_set = set(cand.split())
         jacc = len(want_set & cand_set) / max(1, len(want_set | cand_set))
 
@@ -180,34 +353,100 @@ def crossref_best_match(s: requests.Session, title: str, year: str) -> dict | No
 
         return jacc + year_bonus
 
-    best = max(items, key=score)
-    if score(best) < 0.35:
+    # Score each candidate once; max() keeps the first of equal scores.
+    best_score, best = max(((score(it), it) for it in items), key=lambda t: t[0])
+    if best_score < 0.35:
         return None
     return best
 
 
-def crossref_bibtex(s: requests.Session, doi: str) -> str | None:
+def crossref_batch(
+    s: requests.Session, cache: HttpCache, titles_years: list[tuple[str, str]]
+) -> dict[tuple[str, str], dict]:
+    # One lookup per distinct (normalized title, year), run concurrently. The
+    # year matters: the same title in two years (e.g. a conference paper and
+    # its journal extension) is scored separately. Unmatched pairs are left out.
+    unique: dict[tuple[str, str], tuple[str, str]] = {}
+    for title, year in titles_years:
+        unique.setdefault((_norm_title(title), year), (title, year))
+
+    with ThreadPoolExecutor(max_workers=CROSSREF_WORKERS) as ex:
+        results = ex.map(lambda q: crossref_best_match(s, cache, *q), unique.values())
+        return {key: cr for key, cr in zip(unique, results) if cr}
+
+
+def crossref_bibtex(s: requests.Session, cache: HttpCache, doi: str) -> str | None:
     doi_enc = urllib.parse.quote(doi)
     url = f"https://api.crossref.org/works/{doi_enc}/transform/application/x-bibtex"
     try:
-        r = s.get(url, timeout=30, headers={"User-Agent": UA})
-        if r.status_code != 200:
+        with _CROSSREF_SLOTS:
+            status, body = cache.get(s, url)
+        if status != 200:
             return None
-        return r.text.strip() + "\n"
+        return body.decode("utf-8").strip() + "\n"
     except Exception:
         return None
 
 
+def _item_to_bibtex(item: dict) -> str | None:
+    # Build the BibTeX record from the /works query item we already have,
+    # saving the transform round trip. Same one-line layout and field order as
+    # Crossref's own x-bibtex export. None if title or authors are missing.
+    title = _clean((item.get("title") or [""])[0])
+    authors: list[str] = []
+    for a in item.get("author") or []:
+        if a.get("family"):
+            authors.append(f"{a['family']}, {a['given']}" if a.get("given") else a["family"])
+        elif a.get("name"):
+            authors.append(a["name"])
+    if not title or not authors:
+        return None
+
+    year = ""
+    month = ""
+    issued = (item.get("issued") or {}).get("date-parts") or []
+    if issued and issued[0] and issued[0][0]:
+        year = str(issued[0][0])
+        if len(issued[0]) > 1 and 1 <= (issued[0][1] or 0) <= 12:
+            month = _MONTHS[issued[0][1] - 1]
+
+    entry_type, container_field = _BIBTEX_TYPES.get(item.get("type", ""), ("misc", "howpublished"))
+    first_family = authors[0].split(",")[0]
+    key = _RE_BIB_KEY.sub("_", f"{first_family}_{year or 'noyear'}").strip("_")
+
+    container = _clean((item.get("container-title") or [""])[0]) if container_field else ""
+    fields = [
+        ("title", title),
+        ("volume", item.get("volume")),
+        ("ISSN", (item.get("ISSN") or [""])[0]),
+        ("url", item.get("URL")),
+        ("DOI", item.get("DOI")),
+        ("number", item.get("issue")),
+        (container_field, container),
+        ("publisher", item.get("publisher")),
+        ("author", " and ".join(authors)),
+        ("year", year),
+    ]
+    parts = [f"{k}={{{v}}}" for k, v in fields if v]
+    if month:
+        parts.append(f"month={month}")
+    if item.get("page"):
+        parts.append(f"pages={{{item['page']}}}")
+    return f"@{entry_type}{{{key}, {', '.join(parts)} }}\n"
+
+
 def _sanitize_doi(doi: str) -> str:
     # Keep filenames stable and filesystem-safe.
     s = doi.strip().lower()
     s = s.replace("https://doi.org/", "")
     s = s.replace("http://doi.org/", "")
-    s = s.replace("/", "_")
-    s = re.sub(r"[^a-z0-9._-]+", "_", s)
+    s = s.replace("/", "_").translate(_DOI_TRANS)
+    if "\0" in s:
+        s = _RE_NUL_RUN.sub("_", s)
     return s
 
 
+@functools.lru_cache(maxsize=4096)
 def _slug(s: str) -> str:
     s = _norm_title(s)
     s = s.replace(" ", "-")
@@ -221,30 +460,74 @@ def _make_id_fallback(p: Pub) -> str:
     return f"{_slug(p.title)}-{p.year or 'noyear'}-{h}"
 
 
+def _write_if_changed(path: str, content: str) -> bool:
+    # Leave the file (and its mtime) alone when the bytes already match, so
+    # reruns don't churn git or downstream caches; otherwise replace atomically.
+    data = content.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    # Per-thread temp name: the writer pool may write several files at once.
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
 def write_bibtex_file(filename: str, content: str) -> None:
-    os.makedirs(BIB_DIR, exist_ok=True)
-    path = os.path.join(BIB_DIR, filename)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+    # BIB_DIR is created once by main.
+    _write_if_changed(os.path.join(BIB_DIR, filename), content)
+
+
+def write_combined_bibtex(entries: Iterable[tuple[str, str]]) -> dict[str, str]:
+    # All records in one file (one write instead of one per paper). Crossref
+    # style Family_Year keys collide across papers, so a repeated key gets the
+    # entry's filename stem (DOI-derived) appended. Returns filename -> key so
+    # each card can point at its own entry.
+    keys: dict[str, str] = {}
+    used: set[str] = set()
+    records: list[str] = []
+    for filename, content in entries:
+        if filename in keys:
+            # Papers sharing a DOI share a record.
+            continue
+        m = _RE_BIB_ENTRY_KEY.match(content)
+        key = m.group(2) if m else ""
+        if not key or key in used:
+            stem = _RE_BIB_KEY.sub("_", os.path.splitext(filename)[0]).strip("_")
+            base = key = f"{key}_{stem}" if key else stem
+            n = 2
+            while key in used:
+                key = f"{base}_{n}"
+                n += 1
+            if m:
+                content = f"{m.group(1)}{key}{content[m.end():]}"
+        used.add(key)
+        keys[filename] = key
+        records.append(content)
+    _write_if_changed(COMBINED_BIB, "\n".join(records))
+    return keys
 
 
 def _escape_attr(u: str) -> str:
     return html.escape(u, quote=True)
 
 
-def build_publications_html(pubs: Iterable[EnrichedPub]) -> str:
-    groups: dict[str, list[EnrichedPub]] = {}
+def build_publications_html(pubs: Iterable[EnrichedPub], bib_hrefs: dict[str, str] | None = None) -> str:
+    # bib_hrefs overrides the per-paper bibtex/<file> link (see --combined).
+    groups: defaultdict[str, list[EnrichedPub]] = defaultdict(list)
     for p in pubs:
-        y = p.pub.year or "Unknown"
-        groups.setdefault(y, []).append(p)
+        groups[p.pub.year or "Unknown"].append(p)
+    # Newest first; non-numeric years ("Unknown") go last.
+    sorted_years = sorted(groups, key=lambda y: int(y) if y.isdigit() else -1, reverse=True)
 
-    def year_key(y: str) -> int:
-        return int(y) if y.isdigit() else -1
-
-    out: list[str] = []
-    for y in sorted(groups.keys(), key=year_key, reverse=True):
-        out.append(f'    <h3 class="pub-year">{html.escape(y)}</h3>')
-        out.append('    <div class="pub-list">')
+    buf = io.StringIO()
+    for y in sorted_years:
+        buf.write(f'    <h3 class="pub-year">{html.escape(y)}</h3>\n    <div class="pub-list">\n')
         for ep in groups[y]:
             p = ep.pub
             where = p.venue
@@ -252,200 +535,233 @@ def build_publications_html(pubs: Iterable[EnrichedPub]) -> str:
                 where = f"{where}, {p.year}" if where else p.year
 
             cite = f"{p.authors}, “{p.title},” {p.venue}, {p.year}.".strip()
-            cite = re.sub(r"\s+", " ", cite)
+            cite = _RE_WS.sub(" ", cite)
 
             link_url = ep.link_url or ep.doi_url or p.scholar_url
             paper_url = ep.pdf_url or link_url
 
-            bib_href = f"bibtex/{ep.bib_filename}" if ep.bib_filename else "#"
-
-            out.append('      <article class="card pub-card">')
-            out.append('        <div class="pub-top">')
-            out.append(f'          <div class="pub-where">{html.escape(where)}</div>')
-            out.append('          <div class="badges">')
-            if p.year:
-                out.append(f'            <span class="badge">{html.escape(p.year)}</span>')
-            out.append('            <span class="badge badge-muted">Q?</span>')
-            out.append('          </div>')
-            out.append('        </div>')
-            out.append(f'        <p class="pub-cite">{html.escape(cite)}</p>')
-
-            if ep.doi and ep.doi_url:
-                out.append(
-                    '        <p class="pub-doi">DOI: '
-                    f'<a href="{_escape_attr(ep.doi_url)}">{html.escape(ep.doi)}</a></p>'
-                )
-
-            out.append('        <div class="pub-links">')
-            out.append(f'          <a href="{_escape_attr(link_url)}">Link</a>')
-            out.append(f'          <a href="{_escape_attr(p.scholar_url)}">Scholar</a>')
-            if ep.bib_filename:
-                out.append(
-                    f'          <a href="{_escape_attr(bib_href)}" download>BiBTeX</a>'
-                )
-            else:
-                out.append('          <a href="#">BibTeX</a>')
-            out.append(f'          <a href="{_escape_attr(paper_url)}">Paper</a>')
-            out.append('          <a href="#">Video</a>')
-            out.append('        </div>')
-            out.append('      </article>')
-        out.append('    </div>')
-
-    return "\n".join(out) + "\n"
+            # Optional fragments, each carrying its own trailing newline.
+            year_badge = f'            <span class="badge">{html.escape(p.year)}</span>\n' if p.year else ""
+            doi_line = (
+                '        <p class="pub-doi">DOI: '
+                f'<a href="{_escape_attr(ep.doi_url)}">{html.escape(ep.doi)}</a></p>\n'
+                if ep.doi and ep.doi_url
+                else ""
+            )
+            bib_link = (
+                f'<a href="{_escape_attr((bib_hrefs or {}).get(ep.bib_filename) or f"bibtex/{ep.bib_filename}")}" download>BiBTeX</a>'
+                if ep.bib_filename
+                else '<a href="#">BibTeX</a>'
+            )
 
+            buf.write(
+                '      <article class="card pub-card">\n'
+                '        <div class="pub-top">\n'
+                f'          <div class="pub-where">{html.escape(where)}</div>\n'
+                '          <div class="badges">\n'
+                f"{year_badge}"
+                '            <span class="badge badge-muted">Q?</span>\n'
+                '          </div>\n'
+                '        </div>\n'
+                f'        <p class="pub-cite">{html.escape(cite)}</p>\n'
+                f"{doi_line}"
+                '        <div class="pub-links">\n'
+                f'          <a href="{_escape_attr(link_url)}">Link</a>\n'
+                f'          <a href="{_escape_attr(p.scholar_url)}">Scholar</a>\n'
+                f"          {bib_link}\n"
+                f'          <a href="{_escape_attr(paper_url)}">Paper</a>\n'
+                '          <a href="#">Video</a>\n'
+                '        </div>\n'
+                '      </article>\n'
+            )
+        buf.write("    </div>\n")
 
-def write_publications_page(pubs_html: str) -> None:
-    doc = f"""<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-  <meta charset=\"utf-8\" />
-  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-  <title>Publications – Francisco Martín Rico</title>
-    <meta name=\"description\" content=\"Publications by Francisco Martín Rico (selected papers, journals, conferences, books) with DOI and BibTeX links.\" />
-  <meta name=\"robots\" content=\"index, follow\" />
-    <meta name=\"author\" content=\"Francisco Martín Rico\" />
-    <link rel=\"canonical\" href=\"https://fmrico.github.io/publications.html\" />
-    <link rel=\"icon\" href=\"img/fmrico.png\" type=\"image/png\" />
-
-    <meta property=\"og:site_name\" content=\"Francisco Martín Rico\" />
-    <meta property=\"og:type\" content=\"website\" />
-    <meta property=\"og:title\" content=\"Publications – Francisco Martín Rico\" />
-    <meta property=\"og:description\" content=\"Publications by Francisco Martín Rico with DOI and BibTeX links.\" />
-    <meta property=\"og:url\" content=\"https://fmrico.github.io/publications.html\" />
-    <meta property=\"og:image\" content=\"https://fmrico.github.io/img/fmrico.png\" />
-
-    <meta name=\"twitter:card\" content=\"summary\" />
-    <meta name=\"twitter:title\" content=\"Publications – Francisco Martín Rico\" />
-    <meta name=\"twitter:description\" content=\"Publications by Francisco Martín Rico with DOI and BibTeX links.\" />
-    <meta name=\"twitter:image\" content=\"https://fmrico.github.io/img/fmrico.png\" />
-    <meta name=\"twitter:site\" content=\"@fmrico\" />
-
-    <script type=\"application/ld+json\">
-    {{
-        \"@context\": \"https://schema.org\",
-        \"@type\": \"CollectionPage\",
-        \"name\": \"Publications – Francisco Martín Rico\",
-        \"url\": \"https://fmrico.github.io/publications.html\",
-        \"about\": {{
-            \"@type\": \"Person\",
-            \"name\": \"Francisco Martín Rico\",
-            \"url\": \"https://fmrico.github.io/\"
-        }}
-    }}
-    </script>
-  <link rel=\"stylesheet\" href=\"styles.css\" />
-</head>
-<body>
-
-<header>
-  <div class=\"topbar\">
-    <div class=\"brand\">
-      <p class=\"brand-title\">Francisco Martín Rico</p>
-      <p class=\"brand-subtitle\">Academic homepage</p>
-    </div>
-    <nav class=\"nav\" aria-label=\"Primary\">
-      <a href=\"index.html\">Home</a>
-      <a href=\"publications.html\" aria-current=\"page\">Publications</a>
-      <a href=\"projects.html\">Projects</a>
-    </nav>
-  </div>
-</header>
-
-<main>
-  <div class=\"hero\">
-    <div>
-      <h1>Publications</h1>
-    </div>
-  </div>
-
-  <section>
-    <h2>List</h2>
-{pubs_html}  </section>
-</main>
-
-<footer>
-  <div class=\"footer-inner\">
-    <p>© {time.gmtime().tm_year} Francisco Martín Rico</p>
-    <p class=\"muted\">Static HTML + CSS (GitHub Pages).</p>
-  </div>
-</footer>
-
-</body>
-</html>
-"""
+    return buf.getvalue()
 
-    with open(OUT_HTML, "w", encoding="utf-8") as f:
-        f.write(doc)
 
+def write_publications_page(pubs_html: str) -> None:
+    with open(PUBLICATIONS_TEMPLATE, "r", encoding="utf-8") as f:
+        tmpl = string.Template(f.read())
+    doc = tmpl.substitute(year=time.gmtime().tm_year, pubs_html=pubs_html)
+
+    _write_if_changed(OUT_HTML, doc)
+
+
+def enrich_pub(
+    s: requests.Session,
+    cache: HttpCache,
+    p: Pub,
+    matches: dict[tuple[str, str], dict],
+    *,
+    skip_existing_bib: bool = False,
+) -> tuple[EnrichedPub, str | None]:
+    # Returns the enriched pub plus its BibTeX content; writing is left to the
+    # caller. Content is None when skip_existing_bib finds the DOI's file.
+    ep = EnrichedPub(pub=p)
+
+    # Link (publisher landing page) from Scholar citation details
+    ep.link_url = fetch_scholar_external_link(s, cache, p.scholar_url)
+
+    # Crossref DOI + BibTeX + PDF (best-effort)
+    cr = matches.get((_norm_title(p.title), p.year))
+    if cr:
+        doi = cr.get("DOI")
+        if doi:
+            ep.doi = doi
+            ep.doi_url = f"https://doi.org/{doi}"
+
+        if isinstance(cr.get("link"), list):
+            for link in cr.get("link"):
+                u = link.get("URL")
+                if not u:
+                    continue
+                if u.lower().endswith(".pdf") or "pdf" in u.lower():
+                    ep.pdf_url = u
+                    break
+            if not ep.pdf_url and cr.get("link"):
+                # Some records provide a PDF URL without an obvious content-type.
+                ep.pdf_url = cr.get("link")[0].get("URL")
+
+    # BibTeX file generation
+    bib_content = None
+    bib_filename = None
+    if ep.doi:
+        bib_filename = f"{_sanitize_doi(ep.doi)}.bib"
+        bib_path = os.path.join(BIB_DIR, bib_filename)
+        if skip_existing_bib and os.path.exists(bib_path):
+            ep.bib_filename = bib_filename
+            return ep, None
+        try:
+            with open(bib_path, "r", encoding="utf-8") as f:
+                existing: str | None = f.read()
+        except FileNotFoundError:
+            existing = None
+        synthesized = _item_to_bibtex(cr)
+        if existing is None or existing == synthesized:
+            bib_content = synthesized or crossref_bibtex(s, cache, ep.doi)
+        else:
+            # Files from Crossref's x-bibtex export keep coming from it, so
+            # reruns don't rewrite them in the synthesized layout.
+            bib_content = crossref_bibtex(s, cache, ep.doi) or synthesized
+
+    if not bib_content:
+        # Minimal fallback BibTeX (keeps per-paper files even when DOI lookup fails)
+        key = _make_id_fallback(p)
+        bib_filename = f"{key}.bib"
+        bib_content = (
+            f"@misc{{{key},\n"
+            f"  title={{{p.title}}},\n"
+            f"  author={{{p.authors}}},\n"
+            + (f"  year={{{p.year}}},\n" if p.year else "")
+            + (f"  howpublished={{{p.venue}}},\n" if p.venue else "")
+            + f"  note={{Google Scholar entry}}\n"
+            f"}}\n"
+        )
 
-def main() -> None:
+    ep.bib_filename = bib_filename
+    return ep, bib_content
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Update publications.html and bibtex/ from Google Scholar + Crossref.")
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore cached Scholar detail pages and Crossref responses (they are refreshed on disk)",
+    )
+    ap.add_argument(
+        "--from-year",
+        type=int,
+        metavar="YEAR",
+        help="only process publications from YEAR onwards (partial run: publications.html is left untouched)",
+    )
+    ap.add_argument(
+        "--max",
+        type=int,
+        metavar="N",
+        help="only process the first N publications (partial run: publications.html is left untouched)",
+    )
+    ap.add_argument(
+        "--only-missing-bibtex",
+        action="store_true",
+        help="don't fetch or rewrite BibTeX for DOIs whose bibtex/ file already exists",
+    )
+    ap.add_argument(
+        "--combined",
+        action="store_true",
+        help="write every record to a single bibtex.bib, with unique keys, and link each card to its entry",
+    )
+    args = ap.parse_args(argv)
+    if args.combined and (args.from_year is not None or args.max is not None or args.only_missing_bibtex):
+        ap.error("--combined rewrites the whole bibtex.bib and cannot be used with partial runs")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
     s = _session()
+    cache = HttpCache(HTTP_CACHE_DIR, refresh=args.no_cache)
 
     pubs = fetch_scholar_publications(s)
     print(f"Fetched {len(pubs)} publications from Scholar")
 
-    enriched: list[EnrichedPub] = []
-
-    for i, p in enumerate(pubs, start=1):
-        ep = EnrichedPub(pub=p)
-
-        # Link (publisher landing page) from Scholar citation details
-        ep.link_url = fetch_scholar_external_link(s, p.scholar_url)
-
-        # Crossref DOI + BibTeX + PDF (best-effort)
-        cr = crossref_best_match(s, p.title, p.year)
-        if cr:
-            doi = cr.get("DOI")
-            if doi:
-                ep.doi = doi
-                ep.doi_url = f"https://doi.org/{doi}"
-
-            if isinstance(cr.get("link"), list):
-                for link in cr.get("link"):
-                    u = link.get("URL")
-                    if not u:
-                        continue
-                    if u.lower().endswith(".pdf") or "pdf" in u.lower():
-                        ep.pdf_url = u
-                        break
-                if not ep.pdf_url and cr.get("link"):
-                    # Some records provide a PDF URL without an obvious content-type.
-                    ep.pdf_url = cr.get("link")[0].get("URL")
-
-        # BibTeX file generation
-        bib_content = None
-        bib_filename = None
-        if ep.doi:
-            bib_content = crossref_bibtex(s, ep.doi)
-            bib_filename = f"{_sanitize_doi(ep.doi)}.bib"
-
-        if not bib_content:
-            # Minimal fallback BibTeX (keeps per-paper files even when DOI lookup fails)
-            key = _make_id_fallback(p)
-            bib_filename = f"{key}.bib"
-            bib_content = (
-                f"@misc{{{key},\n"
-                f"  title={{{p.title}}},\n"
-                f"  author={{{p.authors}}},\n"
-                + (f"  year={{{p.year}}},\n" if p.year else "")
-                + (f"  howpublished={{{p.venue}}},\n" if p.venue else "")
-                + f"  note={{Google Scholar entry}}\n"
-                f"}}\n"
-            )
+    # A partial run only refreshes BibTeX files; rendering the page from a
+    # subset would drop the other publications.
+    partial = args.from_year is not None or args.max is not None
+    if args.from_year is not None:
+        pubs = [p for p in pubs if p.year.isdigit() and int(p.year) >= args.from_year]
+    if args.max is not None:
+        pubs = pubs[: args.max]
+    if partial:
+        print(f"Partial run: processing {len(pubs)} publications")
 
-        ep.bib_filename = bib_filename
-        write_bibtex_file(bib_filename, bib_content)
+    matches = crossref_batch(s, cache, [(p.title, p.year) for p in pubs])
+    print(f"Matched {len(matches)} titles on Crossref")
 
-        enriched.append(ep)
-
-        if i % 20 == 0:
-            print(f"Enriched {i}/{len(pubs)}")
-
-    pubs_html = build_publications_html(enriched)
-    write_publications_page(pubs_html)
-
-    print(f"Wrote {OUT_HTML}")
-    print(f"Wrote BibTeX files in {BIB_DIR}")
+    enriched: list[EnrichedPub] = []
+    writes: list[Future] = []
+    # Pubs resolving to the same DOI share a file; write it once.
+    submitted: set[str] = set()
+    combined: list[tuple[str, str]] = []
+    if not args.combined:
+        os.makedirs(BIB_DIR, exist_ok=True)
+
+    with (
+        ThreadPoolExecutor(max_workers=CROSSREF_WORKERS) as ex,
+        ThreadPoolExecutor(max_workers=WRITER_WORKERS) as writer,
+    ):
+        results = ex.map(lambda p: enrich_pub(s, cache, p, matches, skip_existing_bib=args.only_missing_bibtex), pubs)
+        for i, (ep, bib_content) in enumerate(results, start=1):
+            enriched.append(ep)
+            if args.combined:
+                combined.append((ep.bib_filename, bib_content))
+            elif bib_content is not None and ep.bib_filename not in submitted:
+                submitted.add(ep.bib_filename)
+                writes.append(writer.submit(write_bibtex_file, ep.bib_filename, bib_content))
+
+            if i % 20 == 0:
+                print(f"Enriched {i}/{len(pubs)}")
+
+    # Surface any write errors.
+    for f in writes:
+        f.result()
+    bib_hrefs: dict[str, str] | None = None
+    if args.combined:
+        # Each card links to its own entry, addressed by its (unique) key.
+        combined_name = os.path.basename(COMBINED_BIB)
+        keys = write_combined_bibtex(combined)
+        bib_hrefs = {filename: f"{combined_name}#{key}" for filename, key in keys.items()}
+
+    if partial:
+        print(f"Partial run: left {OUT_HTML} unchanged")
+    else:
+        pubs_html = build_publications_html(enriched, bib_hrefs=bib_hrefs)
+        write_publications_page(pubs_html)
+        print(f"Wrote {OUT_HTML}")
+    if args.combined:
+        print(f"Wrote {COMBINED_BIB}")
+    else:
+        print(f"Wrote BibTeX files in {BIB_DIR}")
 
 
 if __name__ == "__main__":